@@ -0,0 +1,312 @@
+import contextlib
+import io
+import json
+import random
+import re
+import threading
+import unittest
+
+from main import _CATEGORY_INSTRUCTIONS, QuestionClassifier
+
+
+class FakeResponse:
+    def __init__(self, text):
+        self.text = text
+
+
+class FakeBatchModel:
+    """Stands in for the Gemini model, replying to batch prompts with fixed items."""
+
+    def __init__(self, items):
+        self.items = items
+        self.prompts = []
+
+    def generate_content(self, prompt, stream=False):
+        self.prompts.append(prompt)
+        return FakeResponse(json.dumps(self.items))
+
+
+class NumberedBatchModel:
+    """Answers batch prompts as opinions (math if the question has '^') whose
+    confidence encodes the question number, failing any prompt that contains
+    `fail_on`."""
+
+    def __init__(self, fail_on=None):
+        self.fail_on = fail_on
+        self.questions = []
+        self.lock = threading.Lock()
+
+    def generate_content(self, prompt, stream=False):
+        questions = re.findall(r'^(\d+)\. "(.*)"$', prompt, re.M)
+        with self.lock:
+            self.questions.extend(question for _, question in questions)
+        if self.fail_on and any(question == self.fail_on for _, question in questions):
+            raise ConnectionError("network down")
+        items = [
+            {
+                "index": int(index),
+                "category": "math" if "^" in question else "opinion",
+                "confidence": int(re.search(r'\d+', question).group()) / 100,
+            }
+            for index, question in questions
+        ]
+        return FakeResponse(json.dumps(items))
+
+
+class ChunkedStreamModel:
+    """Streams a fixed reply in the given chunks, counting how many were read."""
+
+    def __init__(self, chunks):
+        self.chunks = chunks
+        self.read = 0
+
+    def generate_content(self, prompt, stream=False):
+        for chunk in self.chunks:
+            self.read += 1
+            yield FakeResponse(chunk)
+
+
+class FlakyStreamModel:
+    """Fails the first request, then streams a math classification."""
+
+    def __init__(self):
+        self.calls = 0
+
+    def generate_content(self, prompt, stream=False):
+        self.calls += 1
+        if self.calls == 1:
+            raise ConnectionError("network down")
+        return [FakeResponse('{"category": "math", "confidence": 0.95}')]
+
+
+class ClassifyQuestionTest(unittest.TestCase):
+    def test_gemini_failure_fallback_is_not_cached(self):
+        classifier = QuestionClassifier()
+        classifier.model = FlakyStreamModel()
+
+        fallback = classifier.classify_question("What is 2 + 3?")
+        retried = classifier.classify_question("What is 2 + 3?")
+        cached = classifier.classify_question("What is 2 + 3?")
+
+        self.assertEqual(fallback.confidence, 0.8)
+        self.assertEqual(retried.confidence, 0.95)
+        self.assertIs(cached, retried)
+        self.assertEqual(classifier.model.calls, 2)
+
+
+    def test_stream_ignores_fields_before_the_json_object(self):
+        classifier = QuestionClassifier()
+        classifier.model = ChunkedStreamModel([
+            'Sure! The "category": "math", ',
+            '"confidence": 0.3, here you go: ',
+            '{"category": "opinion", "confidence": 0.8}',
+        ])
+
+        result = classifier.classify_question("Is pizza good?")
+
+        self.assertEqual((result.category, result.confidence), ("opinion", 0.8))
+
+
+    def test_local_answer_error_is_not_reported_as_gemini_failure(self):
+        classifier = QuestionClassifier()
+        classifier.model = ChunkedStreamModel(['{"category": "math", "confidence": 0.9}'])
+
+        def broken_percentage(percentage, number):
+            raise RuntimeError("percentage bug")
+
+        classifier._calculate_percentage = broken_percentage
+
+        output = io.StringIO()
+        with contextlib.redirect_stdout(output):
+            with self.assertRaisesRegex(RuntimeError, "percentage bug"):
+                classifier.classify_question("Calculate 15% of 200")
+        self.assertNotIn("Gemini classification failed", output.getvalue())
+
+
+    def _stream(self, chunks, question="What is 2 + 3?"):
+        classifier = QuestionClassifier()
+        classifier.model = ChunkedStreamModel(chunks)
+        return classifier.classify_question(question), classifier.model.read
+
+    def test_stream_stops_once_category_and_confidence_arrive(self):
+        result, read = self._stream([
+            '```json\n{"category": "math", ',
+            '"confidence": 0.95, ',
+            '"reasoning": "Contains ',
+            'arithmetic"}\n```',
+        ])
+
+        self.assertEqual((result.category, result.confidence), ("math", 0.95))
+        self.assertEqual(result.response, "The answer is 5.")
+        self.assertEqual(read, 2)
+
+    def test_stream_waits_for_confidence_split_across_chunks(self):
+        result, read = self._stream([
+            '{"category": "math", "confidence": 0.',
+            '9',
+            '5, "reasoning": "x"}',
+        ])
+
+        self.assertEqual(result.confidence, 0.95)
+        self.assertEqual(read, 3)
+
+    def test_stream_without_early_fields_falls_back_to_full_parse(self):
+        # A quoted confidence is not picked up early, so the whole reply is parsed
+        result, read = self._stream([
+            '{"category": "opinion", ',
+            '"confidence": "0.4", ',
+            '"reasoning": "x"}',
+        ])
+        self.assertEqual((result.category, result.confidence), ("opinion", 0.4))
+        self.assertEqual(read, 3)
+
+        result, read = self._stream(['{"category": "math"', '}'])
+        self.assertEqual((result.category, result.confidence), ("math", 0.5))
+        self.assertEqual(read, 2)
+
+
+class ClassifyQuestionsBatchTest(unittest.TestCase):
+    def _classifier(self, model):
+        classifier = QuestionClassifier()
+        classifier.model = model
+        return classifier
+
+    def test_malformed_confidence_falls_back_to_patterns(self):
+        model = FakeBatchModel([
+            {"index": 0, "category": "math", "confidence": "high"},
+            {"index": 1, "category": "opinion", "confidence": None},
+            {"index": 2, "category": "factual", "confidence": 0.9},
+        ])
+        classifier = self._classifier(model)
+
+        results = classifier.classify_questions_batch(
+            ["What is 2 + 3?", "Which is better?", "Where is Paris?"]
+        )
+
+        self.assertEqual(results[0].category, "math")
+        self.assertEqual(results[0].confidence, 0.8)
+        self.assertEqual(results[0].response, "The answer is 5.")
+        self.assertEqual(results[1].category, "opinion")
+        self.assertEqual(results[1].confidence, 0.7)
+        self.assertEqual(results[2].category, "factual")
+        self.assertEqual(results[2].confidence, 0.9)
+
+    def test_failing_question_only_affects_its_own_entry(self):
+        questions = ["What is 2 + 3?", "Calculate 15% of 200", "Where is Paris?"]
+        models = [
+            None,
+            FakeBatchModel([
+                {"index": 0, "category": "math", "confidence": 0.9},
+                {"index": 1, "category": "math", "confidence": 0.9},
+                {"index": 2, "category": "factual", "confidence": 0.9},
+            ]),
+        ]
+        for model in models:
+            with self.subTest(gemini=model is not None):
+                classifier = self._classifier(model)
+
+                def broken_percentage(percentage, number):
+                    raise RuntimeError("percentage bug")
+
+                classifier._calculate_percentage = broken_percentage
+
+                results = classifier.classify_questions_batch(questions)
+
+                self.assertEqual(results[0].response, "The answer is 5.")
+                self.assertEqual(results[1].confidence, 0.0)
+                self.assertIn("percentage bug", results[1].response)
+                self.assertEqual(results[2].category, "factual")
+
+    def test_batch_prompt_uses_shared_instructions(self):
+        model = FakeBatchModel([])
+        classifier = self._classifier(model)
+
+        classifier.classify_questions_batch(["What is 2 + 3?", "Where is Paris?"])
+
+        (prompt,) = model.prompts
+        self.assertIn(_CATEGORY_INSTRUCTIONS, prompt)
+        self.assertIn('0. "What is 2 + 3?"\n1. "Where is Paris?"', prompt)
+        self.assertFalse(any(line.startswith(" ") for line in prompt.splitlines()))
+
+    def test_large_batch_is_chunked_in_order_and_deduplicated(self):
+        model = NumberedBatchModel()
+        classifier = self._classifier(model)
+        questions = [f"Where is place {i}?" for i in range(45)]
+
+        results = classifier.classify_questions_batch(questions + questions[:5])
+
+        self.assertEqual(sorted(model.questions), sorted(questions))
+        self.assertEqual(
+            [result.confidence for result in results],
+            [i / 100 for i in range(45)] + [i / 100 for i in range(5)],
+        )
+        self.assertEqual(results[45:], results[:5])
+
+    def test_failed_chunk_falls_back_without_dropping_other_chunks(self):
+        model = NumberedBatchModel(fail_on="Where is place 25?")
+        classifier = self._classifier(model)
+        questions = [f"Where is place {i}?" for i in range(45)]
+
+        results = classifier.classify_questions_batch(questions)
+
+        for i, result in enumerate(results):
+            if 20 <= i < 40:
+                self.assertEqual((result.category, result.confidence), ("factual", 0.6))
+            else:
+                self.assertEqual((result.category, result.confidence), ("opinion", i / 100))
+
+    def test_overflowing_question_does_not_drop_other_chunks(self):
+        classifier = self._classifier(NumberedBatchModel())
+        questions = [f"Where is place {i}?" for i in range(45)] + ["What is 9 ^ 9999?"]
+
+        results = classifier.classify_questions_batch(questions)
+
+        self.assertEqual(len(results), 46)
+        self.assertEqual({result.category for result in results[:45]}, {"opinion"})
+        self.assertEqual(results[45].category, "math")
+        self.assertTrue(results[45].response.startswith("I encountered an error calculating that"))
+
+
+class PatternBatchTest(unittest.TestCase):
+    """The joined-text scan must agree with classifying each question alone."""
+
+    FRAGMENTS = [
+        "5", "+", "3", ".", "2", "/", "0", "*", "^", "%", " of ", " ", "\n", "\t", "\x00",
+        "what", " is ", "calculate", "cos", "think", "better", "your", "opinion",
+        "\u0663", "\u0130", "_", "?", "x",
+    ]
+
+    def assertBatchMatchesSingle(self, questions):
+        classifier = QuestionClassifier()
+        expected = [classifier.classify_question(question) for question in questions]
+        self.assertEqual(classifier.classify_questions_batch(questions), expected)
+
+    def test_boundary_cases(self):
+        self.assertBatchMatchesSingle([
+            "What is 5",
+            "+ 3?",
+            "12 %",
+            "of 40",
+            "what is 2\nplus 3",
+            "7\n* 6",
+            "\u0663 + \u0664",
+            "9\x00- 1",
+            "5\n\x00\n+ 3",
+            "which is\nbetter",
+            "\u0130 think so",
+            "",
+            "   ",
+        ])
+
+    def test_randomized_questions(self):
+        rng = random.Random(13)
+        for _ in range(300):
+            questions = [
+                "".join(rng.choice(self.FRAGMENTS) for _ in range(rng.randint(1, 8)))
+                for _ in range(rng.randint(1, 6))
+            ]
+            with self.subTest(questions=questions):
+                self.assertBatchMatchesSingle(questions)
+
+if __name__ == "__main__":
+    unittest.main()